@@ -0,0 +1,106 @@
+from project.utils import Conf, load_encodings, split_holdout
+from project.utils import QuantizedGallery
+import numpy as np
+import tempfile
+import time
+import os
+
+
+def time_queries(search_fn, queries):
+    """
+    Runs one query at a time, as recognition.py does, and returns the
+    matched indexes and the mean latency in milliseconds.
+    """
+    start_time = time.perf_counter()
+    matches = np.array([search_fn(query) for query in queries], dtype=int)
+    elapsed = time.perf_counter() - start_time
+    return matches, elapsed * 1000 / max(1, len(queries))
+
+
+def scale_gallery(gallery, gallery_names, target_size, noise=0.01):
+    """
+    Pads the gallery with jittered copies of its own vectors up to
+    `target_size`, so speed can be measured at campus-wide sizes.
+    """
+    if target_size <= len(gallery):
+        return gallery, gallery_names
+    rng = np.random.default_rng(42)
+    picks = rng.integers(0, len(gallery), target_size - len(gallery))
+    extra = gallery[picks] + rng.normal(0, noise, (len(picks), gallery.shape[1]))
+    return (
+        np.concatenate([gallery, extra]),
+        np.concatenate([gallery_names, gallery_names[picks]]),
+    )
+
+
+def run_benchmark():
+    """
+    Compares memory use, matching speed and agreement of the quantized
+    galleries against the full-precision float64 path.
+    """
+    # Load Application Config
+    app_config = Conf("config/config.json")
+    top_k = max(2, app_config["rerank_top_k"] or 5)
+
+    # 1. Load Face Encodings and split off held-out queries
+    print("[STATUS] Loading face data from disk...")
+    dataset = load_encodings(app_config["encodings_path"])
+    encodings = np.asarray(dataset["encodings"], dtype="float64")
+    names = np.asarray(dataset["names"])
+    gallery_idx, query_idx = split_holdout(names)
+    if len(query_idx) == 0:
+        print("[ERROR] Not enough encodings to hold out any queries.")
+        return
+
+    gallery, gallery_names = scale_gallery(
+        encodings[gallery_idx],
+        names[gallery_idx],
+        app_config["benchmark_gallery_size"] or 0,
+    )
+    queries, query_names = encodings[query_idx], names[query_idx]
+    print(f"[STATUS] {len(gallery)} gallery vectors, {len(queries)} queries")
+
+    # 2. Full-precision reference path, with precomputed norms
+    gallery_norms = (gallery**2).sum(axis=1)
+    baseline, baseline_ms = time_queries(
+        lambda query: int((gallery_norms - 2.0 * gallery.dot(query)).argmin()),
+        queries,
+    )
+    baseline_names = gallery_names[baseline]
+    print(
+        f"[RESULT] {'float64':<15} {gallery.nbytes / 1024:10.1f} KB in memory  "
+        f"{baseline_ms:8.3f} ms/query  "
+        f"accuracy {np.mean(baseline_names == query_names):.2%}"
+    )
+
+    # 3. Quantized paths, with and without memory-mapped float re-ranking
+    reference_dir = tempfile.mkdtemp()
+    for dtype in ("float16", "int8"):
+        for k in (1, top_k):
+            reference_path = None
+            if k > 1:
+                reference_path = os.path.join(reference_dir, f"{dtype}.npy")
+                np.save(reference_path, gallery.astype("float32"))
+            quantized = QuantizedGallery(
+                gallery, gallery_names, dtype=dtype, referencePath=reference_path
+            )
+            matches, query_ms = time_queries(
+                lambda query: quantized.search(query, topK=k)[0], queries
+            )
+            matched_names = gallery_names[matches]
+            label = f"{dtype} (top-{k})" if k > 1 else dtype
+            print(
+                f"[RESULT] {label:<15} {quantized.nbytes() / 1024:10.1f} KB in memory  "
+                f"{query_ms:8.3f} ms/query  "
+                f"accuracy {np.mean(matched_names == query_names):.2%}  "
+                f"agreement {np.mean(matched_names == baseline_names):.2%}  "
+                f"(+{quantized.reference_nbytes() / 1024:.1f} KB mapped from disk)"
+            )
+            del quantized
+            if reference_path is not None:
+                os.remove(reference_path)
+    os.rmdir(reference_dir)
+
+
+if __name__ == "__main__":
+    run_benchmark()
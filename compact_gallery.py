@@ -0,0 +1,120 @@
+from project.utils import Conf, load_encodings, write_encoding_chunk
+from project.utils import nearest_neighbors, compact_gallery, split_holdout
+from project.utils import train_in_memory, chunk_size_for_budget
+from project.utils import write_reference
+import numpy as np
+import time
+
+
+def match_accuracy(queries, query_names, gallery, gallery_names):
+    """
+    Returns nearest-neighbour accuracy and the time taken to match.
+    """
+    start_time = time.perf_counter()
+    best_idx, _ = nearest_neighbors(queries, gallery)
+    elapsed = time.perf_counter() - start_time
+    predicted = np.asarray(gallery_names)[best_idx]
+    return float(np.mean(predicted == np.asarray(query_names))), elapsed
+
+
+def recognizer_accuracy(app_config, queries, query_names, train_enc, train_names):
+    """
+    Trains the recognizer train_model.py would produce for the configured
+    training_mode and returns its accuracy on the queries, predicted as in
+    recognition.py, and the training time.
+    """
+    start_time = time.perf_counter()
+    recognizer_model, label_enc = train_in_memory(
+        app_config["training_mode"],
+        train_enc,
+        train_names,
+        chunk_size_for_budget(app_config["train_memory_budget_mb"] or 256),
+        app_config["train_epochs"] or 5,
+    )
+    elapsed = time.perf_counter() - start_time
+
+    predictions = recognizer_model.predict_proba(queries)
+    predicted = label_enc.classes_[np.argmax(predictions, axis=1)]
+    return float(np.mean(predicted == np.asarray(query_names))), elapsed
+
+
+def run_compaction():
+    """
+    Reduces each identity's encodings to a few prototypes, reports the
+    accuracy impact on held-out encodings and saves the compacted gallery.
+    """
+    # Load Application Config
+    app_config = Conf("config/config.json")
+    max_prototypes = app_config["max_prototypes"] or 5
+
+    # 1. Load Face Encodings
+    print("[STATUS] Loading face data from disk...")
+    dataset = load_encodings(app_config["encodings_path"])
+    encodings = np.asarray(dataset["encodings"], dtype="float64")
+    names = np.asarray(dataset["names"])
+
+    # 2. Measure accuracy impact on held-out encodings
+    train_idx, query_idx = split_holdout(names)
+    if len(query_idx) > 0:
+        print("[STATUS] Measuring accuracy impact...")
+        full_acc, full_time = match_accuracy(
+            encodings[query_idx], names[query_idx],
+            encodings[train_idx], names[train_idx],
+        )
+        proto_enc, proto_names = compact_gallery(
+            encodings[train_idx], names[train_idx], max_prototypes
+        )
+        proto_acc, proto_time = match_accuracy(
+            encodings[query_idx], names[query_idx], proto_enc, proto_names
+        )
+        print(
+            f"[RESULT] Full gallery: {len(train_idx)} vectors, "
+            f"accuracy {full_acc:.2%}, matching {full_time * 1000:.1f} ms"
+        )
+        print(
+            f"[RESULT] Prototypes:   {len(proto_names)} vectors, "
+            f"accuracy {proto_acc:.2%}, matching {proto_time * 1000:.1f} ms"
+        )
+
+        # The recognizer train_model.py produces, trained on each set
+        if len(np.unique(names[train_idx])) >= 2:
+            mode = app_config["training_mode"] or "svm"
+            print(f"[STATUS] Measuring {mode} recognizer accuracy impact...")
+            rec_full_acc, rec_full_time = recognizer_accuracy(
+                app_config,
+                encodings[query_idx], names[query_idx],
+                encodings[train_idx], names[train_idx],
+            )
+            rec_proto_acc, rec_proto_time = recognizer_accuracy(
+                app_config,
+                encodings[query_idx], names[query_idx], proto_enc, proto_names,
+            )
+            print(
+                f"[RESULT] Recognizer on full set:   accuracy {rec_full_acc:.2%}, "
+                f"training {rec_full_time:.2f} s"
+            )
+            print(
+                f"[RESULT] Recognizer on prototypes: accuracy {rec_proto_acc:.2%}, "
+                f"training {rec_proto_time:.2f} s"
+            )
+
+    # 3. Compact the complete gallery
+    print(f"[STATUS] Compacting to at most {max_prototypes} per identity...")
+    compact_enc, compact_names = compact_gallery(encodings, names, max_prototypes)
+    ratio = len(names) / max(1, len(compact_names))
+    print(
+        f"[RESULT] {len(names)} -> {len(compact_names)} encodings "
+        f"({ratio:.1f}x smaller)"
+    )
+
+    # 4. Save Compacted Gallery
+    print("[STATUS] Saving prototypes to disk...")
+    with open(app_config["prototypes_path"], "wb") as file_out:
+        write_encoding_chunk(file_out, compact_enc, list(compact_names))
+
+    # 5. Save full-precision vectors for gallery matching with re-ranking
+    write_reference(app_config["prototypes_path"])
+
+
+if __name__ == "__main__":
+    run_compaction()
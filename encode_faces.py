@@ -1,9 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from project.utils import Conf
+from project.utils import Conf, write_encoding_chunk, write_reference
 from imutils import paths
 import face_recognition
-import pickle
+import random
 import cv2
 import os
 import numpy as np
@@ -18,9 +18,12 @@ def run_face_encoding():
         app_config = Conf("config/config.json")
         dataset_root = os.path.join(app_config["dataset_path"], app_config["class"])
         output_pickle_path = app_config["encodings_path"]
+        chunk_size = app_config["encoding_chunk_size"] or 1000
 
-        # Retrieve all image paths
+        # Retrieve all image paths, shuffled so each stored chunk mixes
+        # identities (required for streaming training to converge)
         all_image_paths = list(paths.list_images(dataset_root))
+        random.shuffle(all_image_paths)
         total_count = len(all_image_paths)
 
         if total_count == 0:
@@ -29,42 +32,59 @@ def run_face_encoding():
             )
             return
 
-        # Storage for encodings and names
+        # Storage for the current chunk of encodings and names, flushed
+        # to disk as a separate record whenever it fills up
         known_encodings_list = []
         known_names_list = []
+        temp_pickle_path = output_pickle_path + ".tmp"
 
         # UI Progress Setup
         progress_bar["maximum"] = total_count
 
-        for idx, img_path in enumerate(all_image_paths):
-            # Update UI
-            progress_bar["value"] = idx + 1
-            lbl_status.config(text=f"Processing: {idx + 1}/{total_count}")
-            main_window.update_idletasks()
-
-            # Extract User ID/Name from directory structure
-            person_name = img_path.split(os.path.sep)[-2]
-            print(f"[LOG] Processing: {img_path} -> {person_name}")
-
-            # Read and process image
-            img_bgr = cv2.imread(img_path)
-            img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-
-            # Convert to grayscale for specific model requirements (triplicated channels)
-            img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
-            img_prepared = np.expand_dims(img_gray, axis=2).repeat(3, axis=2)
-
-            # Generate encodings
-            found_encodings = face_recognition.face_encodings(img_prepared)
-
-            for enc in found_encodings:
-                known_encodings_list.append(enc)
-                known_names_list.append(person_name)
-
-        # Save results to pickle file
-        data_dump = {"encodings": known_encodings_list, "names": known_names_list}
-        with open(output_pickle_path, "wb") as file_handle:
-            pickle.dump(data_dump, file_handle)
+        with open(temp_pickle_path, "wb") as file_handle:
+            for idx, img_path in enumerate(all_image_paths):
+                # Update UI
+                progress_bar["value"] = idx + 1
+                lbl_status.config(text=f"Processing: {idx + 1}/{total_count}")
+                main_window.update_idletasks()
+
+                # Extract User ID/Name from directory structure
+                person_name = img_path.split(os.path.sep)[-2]
+                print(f"[LOG] Processing: {img_path} -> {person_name}")
+
+                # Read and process image
+                img_bgr = cv2.imread(img_path)
+                img_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
+
+                # Convert to grayscale for specific model requirements (triplicated channels)
+                img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
+                img_prepared = np.expand_dims(img_gray, axis=2).repeat(3, axis=2)
+
+                # Generate encodings
+                found_encodings = face_recognition.face_encodings(img_prepared)
+
+                for enc in found_encodings:
+                    known_encodings_list.append(enc)
+                    known_names_list.append(person_name)
+
+                if len(known_encodings_list) >= chunk_size:
+                    write_encoding_chunk(
+                        file_handle, known_encodings_list, known_names_list
+                    )
+                    known_encodings_list = []
+                    known_names_list = []
+
+            # Save the remaining encodings
+            if known_encodings_list:
+                write_encoding_chunk(
+                    file_handle, known_encodings_list, known_names_list
+                )
+
+        # Swap the finished file in
+        os.replace(temp_pickle_path, output_pickle_path)
+
+        # Save full-precision vectors for gallery matching with re-ranking
+        write_reference(output_pickle_path)
 
         messagebox.showinfo("Completed", f"Successfully encoded {total_count} images.")
         close_application()
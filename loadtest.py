@@ -0,0 +1,308 @@
+from project.utils import Conf
+from project.utils.pipeline import RecognitionPipeline
+from imutils import paths
+from tinydb import TinyDB
+import multiprocessing
+import threading
+import queue
+import resource
+import json
+import time
+import sys
+import cv2
+import os
+import numpy as np
+
+
+class LatestFrame:
+    """
+    Single-slot frame buffer that behaves like a live camera: a frame that
+    has not been picked up before the next one arrives is dropped.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.frame = None
+        self.timestamp = None
+        self.closed = False
+
+    def put(self, frame, timestamp):
+        with self.condition:
+            dropped = self.frame is not None
+            self.frame, self.timestamp = frame, timestamp
+            self.condition.notify()
+        return dropped
+
+    def get(self):
+        with self.condition:
+            while self.frame is None and not self.closed:
+                self.condition.wait()
+            frame, timestamp = self.frame, self.timestamp
+            self.frame = None
+        return frame, timestamp
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+def load_frames(source, max_frames):
+    """
+    Reads up to `max_frames` frames from a recorded video file, or from the
+    images of a directory when the source is not a file.
+    """
+    frames = []
+    if os.path.isfile(source):
+        video = cv2.VideoCapture(source)
+        while len(frames) < max_frames:
+            success, frame = video.read()
+            if not success:
+                break
+            frames.append(frame)
+        video.release()
+    else:
+        for img_path in sorted(paths.list_images(source))[:max_frames]:
+            frame = cv2.imread(img_path)
+            if frame is None:
+                print(f"[WARNING] Skipping unreadable image: {img_path}")
+                continue
+            frames.append(frame)
+    return frames
+
+
+def peak_memory_mb():
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def replay_stream(source, max_frames, fps, duration, attendance_path):
+    """
+    Replays the frames of `source` at `fps` for `duration` seconds through
+    the full recognition path and returns the stream statistics.
+    """
+    app_config = Conf("config/config.json")
+    database = TinyDB(app_config["db_path"])
+    pipeline = RecognitionPipeline.from_conf(
+        app_config, database.table("student"), attendancePath=attendance_path
+    )
+
+    # Each stream loads its own frames so the replay buffer can be told
+    # apart from the pipeline's memory
+    frames = load_frames(source, max_frames)
+    if not frames:
+        raise ValueError(f"No frames found to replay in {source}.")
+    frames_mb = sum(frame.nbytes for frame in frames) / (1024 * 1024)
+    baseline_mb = peak_memory_mb()
+
+    slot = LatestFrame()
+    counters = {"produced": 0, "dropped": 0}
+    start_time = time.perf_counter()
+
+    def produce():
+        # Emit frames on a fixed schedule, looping over the recording, and
+        # stamp each with its scheduled capture time so a late wake-up
+        # counts towards latency
+        while True:
+            due = start_time + counters["produced"] / fps
+            if due - start_time >= duration:
+                break
+            time.sleep(max(0.0, due - time.perf_counter()))
+            frame = frames[counters["produced"] % len(frames)]
+            if slot.put(frame.copy(), due):
+                counters["dropped"] += 1
+            counters["produced"] += 1
+        slot.close()
+
+    # Wall-clock window of the replay itself, excluding model loading
+    replay_start = time.time()
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    latencies = []
+    while True:
+        frame, timestamp = slot.get()
+        if frame is None:
+            break
+        pipeline.process(frame)
+        latencies.append(time.perf_counter() - timestamp)
+
+    producer.join()
+    replay_end = time.time()
+    database.close()
+
+    return {
+        "produced": counters["produced"],
+        "dropped": counters["dropped"],
+        "latencies": latencies,
+        "replay_start": replay_start,
+        "replay_end": replay_end,
+        "frames_mb": frames_mb,
+        "baseline_mb": baseline_mb,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def run_stream(stream_idx, source, max_frames, fps, duration, attendance_path,
+               results):
+    """
+    Process entry point: always puts either the statistics or the error
+    of the stream on `results`.
+    """
+    try:
+        stats = replay_stream(source, max_frames, fps, duration, attendance_path)
+        stats["stream"] = stream_idx
+        results.put(stats)
+    except Exception as error:
+        message = f"{type(error).__name__}: {error}"
+        results.put({"stream": stream_idx, "error": message})
+
+
+def collect_results(workers, results, timeout):
+    """
+    Gathers one result per worker, reporting streams that failed, crashed
+    without reporting, or did not finish within `timeout` seconds.
+    """
+    stats, pending = [], set(range(len(workers)))
+    deadline = time.time() + timeout
+    while pending and time.time() < deadline:
+        try:
+            result = results.get(timeout=1)
+        except queue.Empty:
+            # A non-zero exit code without a result means the process died
+            for idx in list(pending):
+                exitcode = workers[idx].exitcode
+                if exitcode is not None and exitcode != 0:
+                    print(f"[ERROR] Stream {idx} crashed (exit code {exitcode}).")
+                    pending.discard(idx)
+            continue
+
+        pending.discard(result["stream"])
+        if "error" in result:
+            print(f"[ERROR] Stream {result['stream']} failed: {result['error']}")
+        else:
+            stats.append(result)
+
+    for idx in pending:
+        print(f"[ERROR] Stream {idx} did not finish in time, terminating.")
+        workers[idx].terminate()
+    return stats
+
+
+def run_load_test():
+    """
+    Replays simulated camera streams in parallel processes, one per door,
+    and reports throughput, frame drops, latency and peak memory.
+    """
+    # Load Application Config
+    app_config = Conf("config/config.json")
+    source = app_config["loadtest_source"] or os.path.join(
+        app_config["dataset_path"], app_config["class"]
+    )
+    streams = app_config["loadtest_streams"] or 4
+    fps = app_config["loadtest_fps"] or 10
+    duration = app_config["loadtest_duration"] or 30
+    output_dir = app_config["loadtest_output_dir"] or "output/loadtest"
+    os.makedirs(output_dir, exist_ok=True)
+
+    max_frames = app_config["loadtest_max_frames"] or 300
+
+    # 1. Check the frames to replay exist, each stream loads its own copy
+    if not os.path.exists(source):
+        print(f"[ERROR] Replay source not found: {source}")
+        return
+
+    # 2. Run every stream in its own process, each with its own
+    # attendance file so the streams do not overwrite each other
+    print(f"[STATUS] Replaying {streams} stream(s) at {fps} FPS for {duration}s...")
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=run_stream,
+            args=(
+                idx,
+                source,
+                max_frames,
+                fps,
+                duration,
+                os.path.join(output_dir, f"attendance_{idx}.json"),
+                results,
+            ),
+        )
+        for idx in range(streams)
+    ]
+    for worker in workers:
+        worker.start()
+    # Allow generous time for each process to load the models
+    stats = collect_results(workers, results, duration + 300)
+    for worker in workers:
+        worker.join()
+    if not stats:
+        print("[ERROR] No stream completed.")
+        return
+
+    # Throughput is measured over the replay window only, from the first
+    # stream starting to replay until the last one finishes
+    elapsed = max(s["replay_end"] for s in stats) - min(
+        s["replay_start"] for s in stats
+    )
+
+    # 3. Aggregate the statistics
+    produced = sum(s["produced"] for s in stats)
+    dropped = sum(s["dropped"] for s in stats)
+    latencies = np.concatenate([s["latencies"] for s in stats]) * 1000
+    p50, p90, p99 = (
+        np.percentile(latencies, [50, 90, 99]) if len(latencies) else (0, 0, 0)
+    )
+    pipeline_peaks = [s["peak_memory_mb"] - s["frames_mb"] for s in stats]
+    report = {
+        "streams": streams,
+        "failed_streams": streams - len(stats),
+        "target_fps": fps,
+        "duration_s": round(elapsed, 2),
+        "processed_frames": int(len(latencies)),
+        "throughput_fps": round(len(latencies) / elapsed, 2),
+        "drop_rate": round(dropped / max(1, produced), 4),
+        "latency_ms": {
+            "p50": round(float(p50), 1),
+            "p90": round(float(p90), 1),
+            "p99": round(float(p99), 1),
+        },
+        # Per stream peak RSS without its replay buffer, the growth of
+        # that peak during the replay, and the sum over streams, which is
+        # an upper bound as pages shared between processes (libraries,
+        # models loaded before forking) are counted once per stream
+        "memory_mb": {
+            "replay_buffer_per_stream": round(stats[0]["frames_mb"], 1),
+            "pipeline_peak_per_stream_max": round(max(pipeline_peaks), 1),
+            "replay_growth_per_stream_max": round(
+                max(s["peak_memory_mb"] - s["baseline_mb"] for s in stats), 1
+            ),
+            "sum_of_stream_peaks_upper_bound": round(sum(pipeline_peaks), 1),
+        },
+    }
+
+    print(f"[RESULT] Throughput: {report['throughput_fps']} frames/s")
+    print(f"[RESULT] Drop rate: {report['drop_rate']:.2%}")
+    print(f"[RESULT] Latency p50/p90/p99: {p50:.1f}/{p90:.1f}/{p99:.1f} ms")
+    memory = report["memory_mb"]
+    print(
+        f"[RESULT] Peak memory per stream: "
+        f"{memory['pipeline_peak_per_stream_max']} MB excluding the "
+        f"{memory['replay_buffer_per_stream']} MB replay buffer "
+        f"(+{memory['replay_growth_per_stream_max']} MB during replay)"
+    )
+    print(
+        f"[RESULT] Sum over streams: at most "
+        f"{memory['sum_of_stream_peaks_upper_bound']} MB "
+        f"(shared pages are counted once per stream)"
+    )
+
+    # 4. Save the report for comparison between runs
+    with open(os.path.join(output_dir, "report.json"), "w") as file_out:
+        json.dump(report, file_out, indent=4)
+
+
+if __name__ == "__main__":
+    run_load_test()
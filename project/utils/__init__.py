@@ -1,2 +1,22 @@
 # import the necessary packages
 from .conf import Conf
+from .encodings import write_encoding_chunk
+from .encodings import iter_encoding_records
+from .encodings import iter_encoding_chunks
+from .encodings import load_encodings
+from .encodings import chunk_size_for_budget
+from .encodings import split_holdout
+from .prototypes import nearest_neighbors
+from .prototypes import select_prototypes
+from .prototypes import compact_gallery
+from .quantize import QuantizedGallery
+from .quantize import reference_path_for
+from .quantize import write_reference
+from .attendance import mark_attendance_log
+from .training import build_recognizer
+from .training import partial_fit_chunk
+from .training import train_in_memory
+
+# FrameRenderer (project.utils.display) and RecognitionPipeline
+# (project.utils.pipeline) are imported from their modules directly, as
+# they pull in tkinter and the dlib models
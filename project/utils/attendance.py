@@ -0,0 +1,49 @@
+# import the necessary packages
+from datetime import datetime
+import json
+
+def mark_attendance_log(userName, userID, enrollPath="database/enroll.json",
+	attendancePath="attendance.json"):
+	# unknown users are never logged
+	if not userName or str(userName).lower() == "unknown":
+		print("[LOG] Unknown user logged.")
+		return
+
+	# load the database files
+	try:
+		with open(enrollPath, "r") as f:
+			enrollData = json.load(f)
+	except FileNotFoundError:
+		enrollData = {"_default": {}, "student": {}}
+
+	try:
+		with open(attendancePath, "r") as f:
+			attendanceData = json.load(f)
+	except FileNotFoundError:
+		attendanceData = {"attendance": {}}
+
+	today = datetime.now().strftime("%Y-%m-%d")
+
+	# check for a duplicate entry today
+	if userID in attendanceData["attendance"]:
+		lastDate = attendanceData["attendance"][userID].get(
+			"date_time", "").split(" ")[0]
+
+		if lastDate == today:
+			return "Already marked present today: {} ({})".format(
+				userName, userID)
+
+	# record the attendance
+	timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+	attendanceData["attendance"][userID] = {
+		"name": userName,
+		"date_time": timestamp,
+	}
+
+	print("[SUCCESS] Attendance marked: {} at {}".format(userName,
+		timestamp))
+
+	with open(attendancePath, "w") as f:
+		json.dump(attendanceData, f, indent=4)
+
+	return None
@@ -0,0 +1,70 @@
+# import the necessary packages
+from PIL import Image, ImageTk
+import numpy as np
+import time
+import cv2
+
+class FrameRenderer:
+	def __init__(self, canvas, width, height, targetFPS):
+		# store the canvas dimensions and the minimum interval between
+		# two redraws
+		self.width = width
+		self.height = height
+		self.interval = 1.0 / targetFPS if targetFPS > 0 else 0.0
+		self.lastDraw = 0.0
+
+		# preallocate the resize and RGBA buffers once, then wrap the
+		# RGBA buffer in a PIL image that shares its memory (Pillow only
+		# maps the buffer for 4-channel modes, "RGB" would be copied)
+		self.resized = np.empty((height, width, 3), dtype="uint8")
+		self.rgba = np.empty((height, width, 4), dtype="uint8")
+		self.pilImage = Image.frombuffer("RGBA", (width, height),
+			self.rgba, "raw", "RGBA", 0, 1)
+
+		# whether the PIL image has been checked to follow the buffer,
+		# and whether it does
+		self.verified = False
+		self.mapped = True
+
+		# create a single photo image and a single canvas item that
+		# are reused for every frame for the whole session
+		self.photo = ImageTk.PhotoImage("RGBA", (width, height))
+		self.item = canvas.create_image(0, 0, anchor="nw",
+			image=self.photo)
+
+	def due(self):
+		# check whether enough time has passed since the last redraw
+		return time.monotonic() - self.lastDraw >= self.interval
+
+	def render(self, frame):
+		# skip the redraw if we are ahead of the target display rate
+		if not self.due():
+			return False
+
+		# resize the frame into the preallocated buffer if needed, then
+		# convert BGR to RGB in place
+		if frame.shape[:2] != (self.height, self.width):
+			cv2.resize(frame, (self.width, self.height), dst=self.resized)
+			frame = self.resized
+
+		cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+
+		# on the first frame check that the PIL image really shows the
+		# buffer contents, otherwise copy the buffer in on every frame
+		if not self.verified:
+			self.mapped = np.array_equal(np.asarray(self.pilImage),
+				self.rgba)
+			self.verified = True
+
+			if not self.mapped:
+				print("[WARNING] Display buffer is not shared, copying frames.")
+
+		if not self.mapped:
+			self.pilImage.frombytes(self.rgba.tobytes())
+
+		# update the existing photo image in place, Tk redraws the
+		# canvas item that references it automatically
+		self.photo.paste(self.pilImage)
+		self.lastDraw = time.monotonic()
+
+		return True
@@ -0,0 +1,117 @@
+# import the necessary packages
+import numpy as np
+import pickle
+
+# approximate number of bytes needed to hold one 128-d float64
+# embedding while it is being trained on (the chunk being trained on,
+# its shuffled copy handed to the classifier, and the next chunk being
+# buffered and concatenated by the reader)
+BYTES_PER_ENCODING = 128 * 8 * 3
+
+# approximate number of bytes needed per encoding of the record being
+# read from disk (the unpickled list of arrays and its stacked copy)
+BYTES_PER_RECORD_ENCODING = 128 * 8 * 2
+
+def write_encoding_chunk(fileHandle, encodings, names):
+	# append a single chunk of encodings and names to an open file,
+	# each chunk is a separate pickle record so it can be read back
+	# without loading the whole file
+	pickle.dump({"encodings": encodings, "names": names}, fileHandle)
+
+def iter_encoding_records(path):
+	# loop over the pickle records stored in the encodings file, older
+	# files written as a single dictionary simply yield one record
+	with open(path, "rb") as fileHandle:
+		while True:
+			try:
+				record = pickle.load(fileHandle)
+			except EOFError:
+				break
+
+			yield (np.asarray(record["encodings"], dtype="float64"),
+				list(record["names"]))
+
+def iter_encoding_chunks(path, chunkSize):
+	# re-chunk the stored records into blocks of at most chunkSize
+	# encodings, buffering only as much as a single block needs
+	bufEncodings = []
+	bufNames = []
+	buffered = 0
+	warned = False
+
+	for (encodings, names) in iter_encoding_records(path):
+		# a record larger than a chunk has already been loaded whole,
+		# warn once as every record is written with the same size
+		if len(names) > chunkSize and not warned:
+			print("[WARNING] {} holds records of up to {} encodings, more "
+				"than the {} per chunk, lower encoding_chunk_size and "
+				"re-run encode_faces.py to stay within the memory "
+				"budget.".format(path, len(names), chunkSize))
+			warned = True
+
+		start = 0
+
+		while start < len(names):
+			end = min(len(names), start + chunkSize - buffered)
+			bufEncodings.append(encodings[start:end])
+			bufNames.extend(names[start:end])
+			buffered += end - start
+			start = end
+
+			if buffered == chunkSize:
+				yield (np.concatenate(bufEncodings), bufNames)
+				bufEncodings = []
+				bufNames = []
+				buffered = 0
+
+	# yield whatever is left over in the buffer
+	if buffered > 0:
+		yield (np.concatenate(bufEncodings), bufNames)
+
+def load_encodings(path):
+	# load every record into memory and merge them into the same
+	# dictionary layout the encoder has always produced
+	encodings = []
+	names = []
+
+	for (chunkEncodings, chunkNames) in iter_encoding_records(path):
+		encodings.extend(chunkEncodings)
+		names.extend(chunkNames)
+
+	return {"encodings": encodings, "names": names}
+
+def chunk_size_for_budget(budgetMB, recordSize=0):
+	# subtract the largest record read from disk from the memory
+	# budget in megabytes, as records are always loaded whole
+	budget = int(budgetMB * 1024 * 1024)
+	budget -= recordSize * BYTES_PER_RECORD_ENCODING
+
+	# if not even a single encoding fits next to the record, the
+	# budget cannot be honoured with the file as written
+	if budget < BYTES_PER_ENCODING:
+		raise ValueError("Records of {} encodings do not fit in a memory "
+			"budget of {} MB, lower encoding_chunk_size and re-run "
+			"encode_faces.py or raise the budget.".format(recordSize,
+			budgetMB))
+
+	# convert the remaining budget to the number of encodings that can
+	# be held in a single training chunk
+	return budget // BYTES_PER_ENCODING
+
+def split_holdout(names, everyNth=5):
+	# hold out every n-th encoding of each identity as a query, the
+	# remaining indexes form the gallery
+	seen = {}
+	galleryIdxs = []
+	queryIdxs = []
+
+	for (i, name) in enumerate(names):
+		seen[name] = seen.get(name, 0) + 1
+
+		if seen[name] % everyNth == 0:
+			queryIdxs.append(i)
+		else:
+			galleryIdxs.append(i)
+
+	return (np.array(galleryIdxs, dtype="int"),
+		np.array(queryIdxs, dtype="int"))
@@ -0,0 +1,112 @@
+# import the necessary packages
+from .attendance import mark_attendance_log
+from .encodings import load_encodings
+from .quantize import QuantizedGallery, reference_path_for
+from tinydb import where
+import face_recognition
+import numpy as np
+import pickle
+import cv2
+
+class RecognitionPipeline:
+	def __init__(self, detectionMethod, usersTable, recognizer, labelEncoder,
+		gallery=None, tolerance=0.6, topK=1, enrollPath="database/enroll.json",
+		attendancePath="attendance.json"):
+		# store the models, the student table and the database paths
+		# used by every processed frame
+		self.detectionMethod = detectionMethod
+		self.usersTable = usersTable
+		self.recognizer = recognizer
+		self.labelEncoder = labelEncoder
+		self.gallery = gallery
+		self.tolerance = tolerance
+		self.topK = topK
+		self.enrollPath = enrollPath
+		self.attendancePath = attendancePath
+
+	@classmethod
+	def from_conf(cls, conf, usersTable, attendancePath="attendance.json"):
+		# load the trained recognizer and label encoder
+		recognizer = pickle.loads(open(conf["recognizer_path"], "rb").read())
+		labelEncoder = pickle.loads(open(conf["le_path"], "rb").read())
+
+		# optionally build a quantized copy of the gallery for
+		# nearest-neighbour matching
+		gallery = None
+		if conf["matcher"] == "gallery":
+			galleryPath = conf["encodings_path"]
+			if conf["use_prototypes"]:
+				galleryPath = conf["prototypes_path"]
+
+			# full precision re-ranking is only used when enabled, the
+			# vectors it needs are memory-mapped from the file written
+			# next to the gallery
+			referencePath = None
+			if (conf["rerank_top_k"] or 0) > 1:
+				referencePath = reference_path_for(galleryPath)
+
+			data = load_encodings(galleryPath)
+			gallery = QuantizedGallery(data["encodings"], data["names"],
+				dtype=conf["gallery_dtype"] or "int8",
+				referencePath=referencePath)
+
+		return cls(conf["detection_method"], usersTable, recognizer,
+			labelEncoder, gallery=gallery,
+			tolerance=conf["match_tolerance"] or 0.6,
+			topK=conf["rerank_top_k"] or 1, enrollPath=conf["db_path"],
+			attendancePath=attendancePath)
+
+	def detect(self, frame):
+		# convert the frame to grayscale, the model expects 3-channel
+		# input so the grayscale channel is duplicated
+		rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+		gray = cv2.cvtColor(rgb, cv2.COLOR_BGR2GRAY)
+		formatted = np.expand_dims(gray, axis=2).repeat(3, axis=2)
+
+		# detect the faces in the frame
+		boxes = face_recognition.face_locations(formatted,
+			model=self.detectionMethod)
+
+		return (rgb, boxes)
+
+	def identify(self, rgb, boxes):
+		# compute the embeddings of the detected faces
+		encodings = face_recognition.face_encodings(rgb, boxes)
+
+		# match the first face against the quantized gallery if one is
+		# available, otherwise use the trained recognizer
+		if self.gallery is not None:
+			(personID, _) = self.gallery.match(encodings[0],
+				tolerance=self.tolerance, topK=self.topK)
+			return personID
+
+		preds = self.recognizer.predict_proba(encodings)[0]
+		return self.labelEncoder.classes_[np.argmax(preds)]
+
+	def lookup(self, personID):
+		# faces outside the gallery tolerance have no ID
+		if personID is None:
+			return "Unknown"
+
+		# fetch the name of the person from the database
+		result = self.usersTable.search(where(personID))
+		if result:
+			return result[0][personID][0]
+
+		return "Unknown ID: {}".format(personID)
+
+	def process(self, frame):
+		# run the full recognition path on a single BGR frame and
+		# return the boxes, the matched ID, the display name and the
+		# attendance log message
+		(rgb, boxes) = self.detect(frame)
+
+		if not boxes:
+			return (boxes, None, None, None)
+
+		personID = self.identify(rgb, boxes)
+		name = self.lookup(personID)
+		logMsg = mark_attendance_log(name, personID, self.enrollPath,
+			self.attendancePath)
+
+		return (boxes, personID, name, logMsg)
@@ -0,0 +1,54 @@
+# import the necessary packages
+from sklearn.cluster import KMeans
+import numpy as np
+
+def nearest_neighbors(queries, gallery, blockSize=1024):
+	# compute the index of and distance to the closest gallery vector
+	# for every query, one block of queries at a time so the full
+	# distance matrix is never materialized
+	gallery = np.asarray(gallery, dtype="float64")
+	galleryNorms = (gallery ** 2).sum(axis=1)
+	indexes = []
+	distances = []
+
+	for start in range(0, len(queries), blockSize):
+		block = np.asarray(queries[start:start + blockSize], dtype="float64")
+		dists = (galleryNorms[None, :] - 2.0 * block.dot(gallery.T)
+			+ (block ** 2).sum(axis=1)[:, None])
+		best = dists.argmin(axis=1)
+		indexes.append(best)
+		distances.append(np.sqrt(np.maximum(
+			dists[np.arange(len(best)), best], 0.0)))
+
+	return (np.concatenate(indexes), np.concatenate(distances))
+
+def select_prototypes(encodings, maxPrototypes):
+	# identities that already have few enough encodings are kept as-is
+	encodings = np.asarray(encodings, dtype="float64")
+	if len(encodings) <= maxPrototypes:
+		return encodings
+
+	# cluster the encodings and keep the real encoding closest to each
+	# cluster center (a medoid), so prototypes are genuine face vectors
+	kmeans = KMeans(n_clusters=maxPrototypes, n_init=3, random_state=42)
+	kmeans.fit(encodings)
+	(indexes, _) = nearest_neighbors(kmeans.cluster_centers_, encodings)
+
+	return encodings[np.unique(indexes)]
+
+def compact_gallery(encodings, names, maxPrototypes):
+	# group the encodings by identity
+	groups = {}
+	for (encoding, name) in zip(encodings, names):
+		groups.setdefault(name, []).append(encoding)
+
+	# reduce every identity to at most maxPrototypes encodings
+	compactEncodings = []
+	compactNames = []
+
+	for (name, group) in groups.items():
+		prototypes = select_prototypes(group, maxPrototypes)
+		compactEncodings.extend(prototypes)
+		compactNames.extend([name] * len(prototypes))
+
+	return (compactEncodings, compactNames)
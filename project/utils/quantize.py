@@ -0,0 +1,134 @@
+# import the necessary packages
+from .encodings import iter_encoding_records
+import numpy as np
+import os
+
+def reference_path_for(galleryPath):
+	# the full precision re-ranking vectors of a gallery live next to it
+	return os.path.splitext(galleryPath)[0] + "_reference.npy"
+
+def write_reference(galleryPath):
+	# count the encodings first so the reference can be filled record by
+	# record without holding the whole gallery in memory
+	count = 0
+	dim = 0
+	for (encodings, _) in iter_encoding_records(galleryPath):
+		count += len(encodings)
+		dim = encodings.shape[1] if len(encodings) else dim
+
+	# write to a temporary file and swap it in, so a process that has
+	# the previous reference mapped keeps reading intact pages
+	path = reference_path_for(galleryPath)
+	tempPath = path + ".tmp.npy"
+	reference = np.lib.format.open_memmap(tempPath, mode="w+",
+		dtype="float32", shape=(count, dim))
+	start = 0
+
+	for (encodings, _) in iter_encoding_records(galleryPath):
+		reference[start:start + len(encodings)] = encodings
+		start += len(encodings)
+
+	reference.flush()
+	del reference
+	os.replace(tempPath, path)
+
+	return path
+
+class QuantizedGallery:
+	def __init__(self, encodings, names, dtype="int8", referencePath=None,
+		blockSize=1024):
+		# store the identity of every gallery vector
+		encodings = np.asarray(encodings, dtype="float32")
+		self.names = np.asarray(names)
+		self.dtype = dtype
+		self.scales = None
+
+		# float16 simply halves the storage of each component
+		if dtype == "float16":
+			self.codes = encodings.astype("float16")
+			self.sqNorms = (self.codes.astype("float32") ** 2).sum(axis=1)
+
+		# int8 stores each vector as signed bytes plus a per-vector
+		# scale that maps the largest component to 127
+		elif dtype == "int8":
+			scales = np.abs(encodings).max(axis=1) / 127.0
+			scales[scales == 0] = 1.0
+			self.codes = np.clip(np.round(encodings / scales[:, None]),
+				-127, 127).astype("int8")
+			self.scales = scales.astype("float32")
+			self.sqNorms = (self.codes.astype("float32") ** 2).sum(axis=1)
+			self.sqNorms *= self.scales ** 2
+
+		# otherwise an unsupported representation was requested
+		else:
+			raise ValueError("unsupported gallery dtype: {}".format(dtype))
+
+		# scratch buffer the codes are widened into one block at a time
+		# before the dot product (not safe to share between threads)
+		self.block = np.empty((blockSize, encodings.shape[1]),
+			dtype="float32")
+
+		# the full precision vectors used for re-ranking are written once
+		# when the gallery is produced and only memory-mapped here, so
+		# only the top candidates are paged in
+		self.reference = None
+		if referencePath is not None:
+			self.reference = np.load(referencePath, mmap_mode="r")
+
+			if self.reference.shape != encodings.shape:
+				raise ValueError("{} does not match the gallery, re-run the "
+					"script that produced the gallery.".format(referencePath))
+
+	def nbytes(self):
+		# number of bytes held in memory and scanned for every query
+		total = self.codes.nbytes + self.sqNorms.nbytes
+
+		if self.scales is not None:
+			total += self.scales.nbytes
+
+		return total
+
+	def reference_nbytes(self):
+		# number of bytes of the memory-mapped re-ranking vectors
+		return 0 if self.reference is None else self.reference.nbytes
+
+	def search(self, query, topK=1):
+		# compute the dot product of the query with every code, one
+		# block at a time, and apply the int8 scales to the result
+		query = np.asarray(query, dtype="float32")
+		dots = np.empty(len(self.codes), dtype="float32")
+
+		for start in range(0, len(self.codes), len(self.block)):
+			rows = self.codes[start:start + len(self.block)]
+			block = self.block[:len(rows)]
+			np.copyto(block, rows)
+			np.dot(block, query, out=dots[start:start + len(rows)])
+
+		if self.scales is not None:
+			dots *= self.scales
+
+		# squared distances from the precomputed norms
+		dists = self.sqNorms - 2.0 * dots + query.dot(query)
+
+		# without re-ranking the quantized distance is final
+		if self.reference is None or topK <= 1:
+			best = int(dists.argmin())
+			return (best, float(np.sqrt(max(dists[best], 0.0))))
+
+		# otherwise re-rank the top candidates at full precision
+		topK = min(topK, len(dists))
+		candidates = np.sort(np.argpartition(dists, topK - 1)[:topK])
+		exact = np.linalg.norm(self.reference[candidates] - query, axis=1)
+		best = int(exact.argmin())
+
+		return (int(candidates[best]), float(exact[best]))
+
+	def match(self, query, tolerance=0.6, topK=1):
+		# return the name of the closest gallery vector, or None if it
+		# is further away than the tolerance
+		(idx, dist) = self.search(query, topK)
+
+		if dist > tolerance:
+			return (None, dist)
+
+		return (self.names[idx], dist)
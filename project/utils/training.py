@@ -0,0 +1,47 @@
+# import the necessary packages
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import SVC
+import numpy as np
+
+def build_recognizer(trainingMode):
+	# the streaming mode needs a model that supports partial_fit, log
+	# loss keeps predict_proba available for recognition.py
+	if trainingMode == "streaming":
+		return SGDClassifier(loss="log_loss", average=True, random_state=42)
+
+	# otherwise train a linear SVM on the full set
+	return SVC(C=1.0, kernel="linear", probability=True)
+
+def partial_fit_chunk(recognizer, labelEncoder, encodings, names, rng):
+	# shuffle within the chunk to avoid feeding one identity at a time,
+	# then update the model with every known class
+	order = rng.permutation(len(names))
+	labels = labelEncoder.transform(names)
+	recognizer.partial_fit(encodings[order], labels[order],
+		classes=np.arange(len(labelEncoder.classes_)))
+
+def train_in_memory(trainingMode, encodings, names, chunkSize=1000, epochs=5):
+	# encode the labels (names -> integers)
+	labelEncoder = LabelEncoder()
+	labels = labelEncoder.fit_transform(names)
+	recognizer = build_recognizer(trainingMode)
+
+	# the SVM is fit on the whole set at once
+	if trainingMode != "streaming":
+		recognizer.fit(encodings, labels)
+		return (recognizer, labelEncoder)
+
+	# the streaming model sees the same chunked epochs as it does when
+	# trained from disk
+	encodings = np.asarray(encodings, dtype="float64")
+	names = np.asarray(names)
+	rng = np.random.default_rng(42)
+
+	for epoch in range(epochs):
+		for start in range(0, len(names), chunkSize):
+			partial_fit_chunk(recognizer, labelEncoder,
+				encodings[start:start + chunkSize],
+				names[start:start + chunkSize], rng)
+
+	return (recognizer, labelEncoder)
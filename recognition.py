@@ -1,77 +1,32 @@
 import tkinter as tk
+import threading
+import math
 import cv2
 import numpy as np
-from PIL import Image, ImageTk
-from datetime import datetime
-import pickle
-import json
-from tinydb import TinyDB, where
-import face_recognition
+from tinydb import TinyDB
 from project.utils import Conf
+from project.utils.display import FrameRenderer
+from project.utils.pipeline import RecognitionPipeline
 
 # --- Initialization ---
 app_config = Conf("config/config.json")
 
-# Load trained models
-recognizer_model = pickle.loads(open(app_config["recognizer_path"], "rb").read())
-label_encoder = pickle.loads(open(app_config["le_path"], "rb").read())
-
 # Database connections
 database = TinyDB(app_config["db_path"])
 users_table = database.table("student")
 
-FILES_PATH = {"enroll": "database/enroll.json", "attendance": "attendance.json"}
+FILES_PATH = {"attendance": "attendance.json"}
+
+# Load trained models and wrap the detection, encoding, matching, lookup
+# and attendance steps shared with loadtest.py
+recognition_pipeline = RecognitionPipeline.from_conf(
+    app_config, users_table, attendancePath=FILES_PATH["attendance"]
+)
 
 # Camera Setup
 video_stream = cv2.VideoCapture(0)
 
 
-def mark_attendance_log(user_name, user_id):
-    """
-    Logs attendance if not already present for the current day.
-    """
-    if not user_name or str(user_name).lower() == "unknown":
-        print("[LOG] Unknown user logged.")
-        return
-
-    # Load Database Files
-    try:
-        with open(FILES_PATH["enroll"], "r") as f:
-            enroll_data = json.load(f)
-    except FileNotFoundError:
-        enroll_data = {"_default": {}, "student": {}}
-
-    try:
-        with open(FILES_PATH["attendance"], "r") as f:
-            attendance_data = json.load(f)
-    except FileNotFoundError:
-        attendance_data = {"attendance": {}}
-
-    today_str = datetime.now().strftime("%Y-%m-%d")
-
-    # Check for duplicate entry today
-    if user_id in attendance_data["attendance"]:
-        last_record_date = (
-            attendance_data["attendance"][user_id].get("date_time", "").split(" ")[0]
-        )
-        if last_record_date == today_str:
-            return f"Already marked present today: {user_name} ({user_id})"
-
-    # Record Attendance
-    timestamp_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    attendance_data["attendance"][user_id] = {
-        "name": user_name,
-        "date_time": timestamp_str,
-    }
-
-    print(f"[SUCCESS] Attendance marked: {user_name} at {timestamp_str}")
-
-    with open(FILES_PATH["attendance"], "w") as f:
-        json.dump(attendance_data, f, indent=4)
-
-    return None
-
-
 # --- UI Application Class (Functional implementation) ---
 
 root_window = tk.Tk()
@@ -84,15 +39,73 @@ lbl_status.pack(pady=20)
 video_canvas = tk.Canvas(root_window, width=640, height=480)
 video_canvas.pack()
 
+# Reuses one canvas item and preallocated buffers, redrawing at the
+# configured display rate regardless of the inference rate
+display_fps = app_config["display_fps"]
+if display_fps is None:
+    display_fps = 15
+display_delay_ms = math.ceil(1000 / display_fps) if display_fps > 0 else 1
+frame_renderer = FrameRenderer(video_canvas, 640, 480, display_fps)
+
 # Global State Variables
 g_prev_person = None
 g_curr_person = None
 g_consec_frames = 0
 g_is_running = False
 
+# Latest captured frame handed to the inference thread, and the latest
+# inference result drawn by the display loop
+g_state_lock = threading.Lock()
+g_frame_ready = threading.Event()
+g_pending_frame = None
+g_last_result = ([], None, None, None)
+g_status_changed = False
+g_display_frame = None
+
+
+def run_inference():
+    """
+    Runs recognition on the most recent captured frame, at whatever rate
+    detection and encoding allow, independently of the display loop.
+    """
+    global g_prev_person, g_curr_person, g_consec_frames
+    global g_pending_frame, g_last_result, g_status_changed
+
+    while g_is_running:
+        if not g_frame_ready.wait(timeout=0.5):
+            continue
+        g_frame_ready.clear()
+
+        with g_state_lock:
+            frame, g_pending_frame = g_pending_frame, None
+        if frame is None:
+            continue
+
+        # Detect, identify, look up and log the person in the frame
+        result = recognition_pipeline.process(frame)
+        detected_boxes, person_id = result[0], result[1]
+
+        if detected_boxes:
+            g_curr_person = person_id
+
+            # Stability Check (Debouncing)
+            if g_prev_person == g_curr_person:
+                g_consec_frames += 1
+            else:
+                g_consec_frames = 0
+            g_prev_person = g_curr_person
 
-def process_video_frame():
-    global g_prev_person, g_curr_person, g_consec_frames, g_is_running
+        with g_state_lock:
+            g_last_result = result
+            g_status_changed = bool(detected_boxes)
+
+
+def refresh_display():
+    """
+    Captures a frame, passes it to the inference thread and redraws the
+    canvas with the latest recognition result at the display rate.
+    """
+    global g_pending_frame, g_status_changed, g_display_frame
 
     if not g_is_running:
         return
@@ -102,48 +115,28 @@ def process_video_frame():
         print("[ERROR] Failed to read from camera.")
         return
 
-    # Image Preprocessing
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    gray_frame = cv2.cvtColor(rgb_frame, cv2.COLOR_BGR2GRAY)
-
-    # Model expects 3-channel input, so duplicate grayscale channels
-    formatted_img = np.expand_dims(gray_frame, axis=2).repeat(3, axis=2)
+    # Annotations are drawn on a reused copy, the inference thread keeps
+    # the untouched frame
+    if g_display_frame is None or g_display_frame.shape != frame.shape:
+        g_display_frame = np.empty_like(frame)
+    np.copyto(g_display_frame, frame)
 
-    # Detect Faces
-    detected_boxes = face_recognition.face_locations(
-        formatted_img, model=app_config["detection_method"]
-    )
+    with g_state_lock:
+        g_pending_frame = frame
+        detected_boxes, _, display_name, log_msg = g_last_result
+        status_changed, g_status_changed = g_status_changed, False
+    g_frame_ready.set()
 
     # Draw Boxes
     for top, right, bottom, left in detected_boxes:
-        cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 2)
+        cv2.rectangle(
+            g_display_frame, (left, top), (right, bottom), (0, 0, 255), 2
+        )
 
     if detected_boxes:
-        # Generate Embeddings
-        face_encodings = face_recognition.face_encodings(rgb_frame, detected_boxes)
-
-        # Predict Identity
-        predictions = recognizer_model.predict_proba(face_encodings)[0]
-        best_match_idx = np.argmax(predictions)
-        g_curr_person = label_encoder.classes_[best_match_idx]
-
-        # Stability Check (Debouncing)
-        if g_prev_person == g_curr_person:
-            g_consec_frames += 1
-        else:
-            g_consec_frames = 0
-        g_prev_person = g_curr_person
-
-        # Fetch Name from DB
-        search_result = users_table.search(where(g_curr_person))
-        if search_result:
-            display_name = search_result[0][g_curr_person][0]
-        else:
-            display_name = f"Unknown ID: {g_curr_person}"
-
         # Overlay Text
         cv2.putText(
-            frame,
+            g_display_frame,
             f"Identity: {display_name}",
             (10, 30),
             cv2.FONT_HERSHEY_SIMPLEX,
@@ -152,28 +145,26 @@ def process_video_frame():
             2,
         )
 
-        # Log Attendance
-        log_msg = mark_attendance_log(display_name, g_curr_person)
+    # Show Attendance Status (Tk widgets are only touched on this thread)
+    if status_changed:
         if log_msg:
             lbl_status.config(text=log_msg)
         else:
             lbl_status.config(text=f"Detected: {display_name}")
 
-    # Update UI Canvas
-    final_img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    pil_image = Image.fromarray(final_img_rgb)
-    tk_image = ImageTk.PhotoImage(image=pil_image)
+    # Update UI Canvas (no new canvas items per frame)
+    frame_renderer.render(g_display_frame)
 
-    video_canvas.create_image(0, 0, anchor="nw", image=tk_image)
-    video_canvas.image = tk_image
-
-    root_window.after(10, process_video_frame)
+    root_window.after(display_delay_ms, refresh_display)
 
 
 def on_start_click():
     global g_is_running
+    if g_is_running:
+        return
     g_is_running = True
-    process_video_frame()
+    threading.Thread(target=run_inference, daemon=True).start()
+    refresh_display()
 
 
 def on_exit_click():
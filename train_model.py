@@ -1,40 +1,120 @@
 import tkinter as tk
 from tkinter import messagebox
-from project.utils import Conf
+from project.utils import Conf, load_encodings
+from project.utils import iter_encoding_records, iter_encoding_chunks
+from project.utils import chunk_size_for_budget
+from project.utils import build_recognizer, partial_fit_chunk
 from sklearn.preprocessing import LabelEncoder
-from sklearn.svm import SVC
+import numpy as np
 import pickle
+import time
+
+
+def report_progress(message):
+    print(f"[STATUS] {message}")
+    lbl_status.config(text=message)
+    main_window.update_idletasks()
+
+
+def train_svm(path_encodings):
+    """
+    Loads all encodings into memory and fits a linear SVM on the full set.
+    """
+    # 1. Load Face Encodings
+    report_progress("Loading face data from disk...")
+    dataset = load_encodings(path_encodings)
+
+    # 2. Encode Labels (Names -> Integers)
+    report_progress("Encoding labels...")
+    label_enc = LabelEncoder()
+    labels = label_enc.fit_transform(dataset["names"])
+
+    # 3. Train the SVM Model
+    report_progress("Training SVM model...")
+    recognizer_model = build_recognizer("svm")
+    # Fit model on embeddings and numeric labels
+    recognizer_model.fit(dataset["encodings"], labels)
+
+    return recognizer_model, label_enc
+
+
+def train_streaming(path_encodings, budget_mb, epochs):
+    """
+    Fits a linear classifier with mini-batch SGD, reading the encodings in
+    chunks sized so that no more than `budget_mb` of them are held at once.
+    """
+    # 1. Scan the labels once to build the label encoder, count samples and
+    # find the largest record, which is always loaded whole
+    report_progress("Scanning labels...")
+    unique_names = set()
+    total_count = 0
+    largest_record = 0
+    for _, names in iter_encoding_records(path_encodings):
+        unique_names.update(names)
+        total_count += len(names)
+        largest_record = max(largest_record, len(names))
+
+    # An unfitted model would only fail later in recognition.py
+    if total_count == 0:
+        raise ValueError(f"No face encodings found in {path_encodings}.")
+    if len(unique_names) < 2:
+        raise ValueError("At least 2 enrolled people are needed for training.")
+
+    # Chunks share the memory budget with the largest stored record
+    chunk_size = chunk_size_for_budget(budget_mb, largest_record)
+
+    label_enc = LabelEncoder()
+    label_enc.fit(sorted(unique_names))
+
+    # 2. Train with partial_fit, one chunk at a time
+    recognizer_model = build_recognizer("streaming")
+    rng = np.random.default_rng(42)
+    total_steps = total_count * epochs
+    done_steps = 0
+    start_time = time.time()
+
+    for epoch in range(epochs):
+        for encodings, names in iter_encoding_chunks(path_encodings, chunk_size):
+            partial_fit_chunk(recognizer_model, label_enc, encodings, names, rng)
+
+            # Progress and estimated time remaining
+            done_steps += len(names)
+            elapsed = time.time() - start_time
+            remaining = elapsed / done_steps * (total_steps - done_steps)
+            report_progress(
+                f"Epoch {epoch + 1}/{epochs}: "
+                f"{100 * done_steps / total_steps:.1f}% (ETA {remaining:.0f}s)"
+            )
+
+    return recognizer_model, label_enc
 
 
 def execute_training():
     """
-    Loads encodings and trains a Support Vector Machine (SVM) classifier.
+    Loads encodings and trains the recognizer, either a Support Vector
+    Machine (SVM) on the full set or a streaming SGD classifier.
     """
     try:
         # Load Application Config
         app_config = Conf("config/config.json")
         path_encodings = app_config["encodings_path"]
+        if app_config["use_prototypes"]:
+            # Train on the compacted gallery written by compact_gallery.py
+            path_encodings = app_config["prototypes_path"]
         path_recognizer = app_config["recognizer_path"]
         path_label_encoder = app_config["le_path"]
 
-        # 1. Load Face Encodings
-        print("[STATUS] Loading face data from disk...")
-        with open(path_encodings, "rb") as file_in:
-            dataset = pickle.load(file_in)
-
-        # 2. Encode Labels (Names -> Integers)
-        print("[STATUS] Encoding labels...")
-        label_enc = LabelEncoder()
-        labels = label_enc.fit_transform(dataset["names"])
-
-        # 3. Train the SVM Model
-        print("[STATUS] Training SVM model...")
-        recognizer_model = SVC(C=1.0, kernel="linear", probability=True)
-        # Fit model on embeddings and numeric labels
-        recognizer_model.fit(dataset["encodings"], labels)
+        if app_config["training_mode"] == "streaming":
+            recognizer_model, label_enc = train_streaming(
+                path_encodings,
+                app_config["train_memory_budget_mb"] or 256,
+                app_config["train_epochs"] or 5,
+            )
+        else:
+            recognizer_model, label_enc = train_svm(path_encodings)
 
         # 4. Save Trained Model
-        print("[STATUS] Saving model to disk...")
+        report_progress("Saving model to disk...")
         with open(path_recognizer, "wb") as file_out:
             pickle.dump(recognizer_model, file_out)
 
@@ -81,6 +161,11 @@ lbl_header = tk.Label(
 )
 lbl_header.pack(pady=10)
 
+lbl_status = tk.Label(
+    main_window, text="Ready to train...", font=("Helvetica", 12), bg="#f4f4f9"
+)
+lbl_status.pack()
+
 # Train Button
 btn_train = tk.Button(
     main_window,